@@ -1,5 +1,5 @@
+import numpy as np
 import pandas as pd
-from datetime import date
 
 class EmployeeCleaner:
     """Cleans employee data: missing values, invalid ranges, and normalizes text."""
@@ -8,48 +8,57 @@ class EmployeeCleaner:
         pass
 
     def clean(self, df: pd.DataFrame) -> pd.DataFrame:
-        out = df.copy()
+        """Returns a new cleaned DataFrame; `df` itself is never modified."""
+        # New/replaced columns are collected here and attached once via df.assign,
+        # so untouched columns are not copied up front
+        cols = {}
 
         # Ensure types (keep start_date as date-safe for comparisons)
-        out["position"] = out["position"].astype("string")
-        out["name"] = out["name"].astype("string")
+        # Arrow-backed strings: .str.strip()/.str.title() run as Arrow compute kernels
+        position = df["position"].astype("string[pyarrow]")
+        name = df["name"].astype("string[pyarrow]")
 
         # Track issues
-        out["issue_missing_name"] = out["name"].isna()
-        out["issue_missing_position"] = out["position"].isna()
-        out["issue_missing_start_date"] = out["start_date"].isna()
-        out["issue_missing_salary"] = out["salary"].isna()
-
-        # Fill missing fields
-        out["name"] = out["name"].fillna("Unknown")
-        out["position"] = out["position"].fillna("Unknown")
-
-        # Salary: coerce numeric, set invalid to NaN then impute with median
-        out["salary"] = pd.to_numeric(out["salary"], errors="coerce")
-        out["issue_invalid_salary"] = (out["salary"] < 60000) | (out["salary"] > 200000)
-        out.loc[out["issue_invalid_salary"], "salary"] = pd.NA
-        out["salary"] = out["salary"].fillna(out["salary"].median()).astype(int)
-
-        # Dates: keep as python date if possible; invalid range -> NaT then impute with mode
-        # Convert to datetime for easier fill, but compare using dates
-        out["start_date"] = pd.to_datetime(out["start_date"], errors="coerce")
-        out["issue_invalid_start_date"] = (
-            (out["start_date"].dt.date < date(2015,1,1)) |
-            (out["start_date"].dt.date > date(2024,12,31))
+        cols["issue_missing_name"] = name.isna()
+        cols["issue_missing_position"] = position.isna()
+        cols["issue_missing_start_date"] = df["start_date"].isna()
+        cols["issue_missing_salary"] = df["salary"].isna()
+
+        # Fill missing fields; normalize position text in the same chain
+        cols["name"] = name.fillna("Unknown")
+        cols["position"] = position.fillna("Unknown").str.strip().str.title()
+
+        # Salary: coerce numeric, treat invalid as missing then impute with median
+        # (float ndarray, so nullable Int64 input with <NA> compares as NaN -> not invalid)
+        sal = pd.to_numeric(df["salary"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        invalid = (sal < 60000) | (sal > 200000)
+        cols["issue_invalid_salary"] = pd.Series(invalid, index=df.index)
+        # One mask, one median over the valid values, one fill (no fillna intermediate)
+        valid = ~np.isnan(sal) & ~invalid
+        if len(sal) > 0 and not valid.any():
+            raise ValueError("No valid salaries to impute the median from")
+        # An empty frame has nothing to fill; skip np.median's empty-slice warning
+        med = np.median(sal[valid]) if valid.any() else 0
+        cols["salary"] = pd.Series(np.where(valid, sal, med).astype(int), index=df.index)
+
+        # Dates: invalid range -> NaT then impute with mode
+        # Compare on datetime64 directly (no per-row python date objects);
+        # "> 2024-12-31" by day is "on or after 2025-01-01" for timestamps
+        start_date = pd.to_datetime(df["start_date"], errors="coerce")
+        cols["issue_invalid_start_date"] = (
+            (start_date < pd.Timestamp("2015-01-01")) |
+            (start_date >= pd.Timestamp("2025-01-01"))
         )
-        out.loc[out["issue_invalid_start_date"], "start_date"] = pd.NaT
+        start_date = start_date.mask(cols["issue_invalid_start_date"])
         # Impute missing dates with most common date (mode). If mode empty, choose 2019-01-01
-        if out["start_date"].dropna().empty:
+        if start_date.dropna().empty:
             fill_dt = pd.Timestamp("2019-01-01")
         else:
-            fill_dt = out["start_date"].mode().iloc[0]
-        out["start_date"] = out["start_date"].fillna(fill_dt)
-
-        # Normalize position text
-        out["position"] = out["position"].str.strip().str.title()
+            fill_dt = start_date.mode().iloc[0]
+        cols["start_date"] = start_date.fillna(fill_dt)
 
-        # Overall data quality flag
-        issue_cols = [c for c in out.columns if c.startswith("issue_")]
-        out["has_any_issue"] = out[issue_cols].any(axis=1)
+        # Overall data quality flag: OR-reduce the issue masks as plain bool arrays
+        issue_arrays = [v.to_numpy(dtype=bool) for k, v in cols.items() if k.startswith("issue_")]
+        cols["has_any_issue"] = np.logical_or.reduce(issue_arrays)
 
-        return out
+        return df.assign(**cols)
@@ -1,5 +1,10 @@
 TIMEZONE = "America/Toronto"
 
+# Seconds a read query result (joins, lookups) is reused in-process; 0 (default)
+# disables it. Opt-in: only DatabaseClient writes and stream_to_copy clear the cache,
+# so writes through db.conn directly or from other sessions show up only after the TTL
+QUERY_CACHE_TTL = 0
+
 POSITIONS = [
     "Data Analyst", "Data Engineer", "ML Engineer", "Software Developer",
     "Cloud Engineer", "DevOps Engineer", "Cybersecurity Analyst",
@@ -1,12 +1,26 @@
+import io
 import os
+import time
+from urllib.parse import quote
+import connectorx as cx
 import psycopg2
 import pandas as pd
+from psycopg2.sql import SQL, Identifier
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
+from .config import QUERY_CACHE_TTL
+
 load_dotenv()
 
+PG_INT_MIN = -2147483648
+PG_INT_MAX = 2147483647
 
-def get_conn():
+# In-process cache for read queries: (get_dsn(), query) -> (fetched_at, DataFrame)
+_QUERY_CACHE = {}
+
+
+def _pg_settings():
     host = os.getenv("PGHOST")
     db = os.getenv("PGDATABASE")
     user = os.getenv("PGUSER")
@@ -15,6 +29,12 @@ def get_conn():
 
     assert all([host, db, user, pw, port]), "Missing one or more Postgres env vars in .env"
 
+    return host, db, user, pw, port
+
+
+def get_conn():
+    host, db, user, pw, port = _pg_settings()
+
     return psycopg2.connect(
         host=host,
         database=db,
@@ -25,6 +45,53 @@ def get_conn():
     )
 
 
+def get_dsn():
+    """Same connection settings as get_conn, as a postgresql:// URL for ConnectorX."""
+    host, db, user, pw, port = _pg_settings()
+    return f"postgresql://{quote(user, safe='')}:{quote(pw, safe='')}@{host}:{port}/{db}?sslmode=require"
+
+
+def clear_query_cache():
+    """Drops every cached read result; called after each write so reads never go stale."""
+    _QUERY_CACHE.clear()
+
+
+def _csv_buffer(df: pd.DataFrame):
+    """Serializes a DataFrame to an in-memory CSV buffer for COPY (NULL = \\N)."""
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, na_rep="\\N", date_format="%Y-%m-%d")
+    buf.seek(0)
+    return buf
+
+
+def _to_int(s: pd.Series, lower=None, upper=None) -> pd.Series:
+    """Coerces to nullable Int64 (bad values -> <NA>) so COPY gets "65000", not "65000.0"."""
+    return pd.to_numeric(s, errors="coerce").clip(lower, upper).round().astype("Int64")
+
+
+def copy_upsert(cur, table: str, columns, buf, on_conflict: str, dedupe_on: str | None = None):
+    """
+    Bulk-loads CSV rows from `buf` into `table` with a single COPY:
+    - COPY streams every row into a TEMP staging table (dropped on commit) holding
+      only the loaded columns, so no defaults (e.g. SERIAL nextval) fire while staging
+    - INSERT ... SELECT moves them across so ON CONFLICT rules still apply
+    - dedupe_on keeps only the last staged row per key, so DO UPDATE never hits the
+      same row twice (last write wins, as with per-row inserts)
+    - synchronous_commit is relaxed for this transaction only (no WAL flush wait)
+    """
+    cols = ", ".join(columns)
+    stg = f"stg_{table}"
+    cur.execute("SET LOCAL synchronous_commit = OFF;")
+    cur.execute(f"CREATE TEMP TABLE {stg} ON COMMIT DROP AS SELECT {cols} FROM {table} WITH NO DATA;")
+    cur.copy_expert(f"COPY {stg} ({cols}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')", buf)
+    if dedupe_on:
+        # Freshly COPYed rows sit in file order, so the highest ctid is the last one
+        select = f"SELECT DISTINCT ON ({dedupe_on}) {cols} FROM {stg} ORDER BY {dedupe_on}, ctid DESC"
+    else:
+        select = f"SELECT {cols} FROM {stg}"
+    cur.execute(f"INSERT INTO {table} ({cols}) {select} {on_conflict};")
+
+
 class DatabaseClient:
     def __init__(self):
         self._conn = None
@@ -41,6 +108,35 @@ class DatabaseClient:
     def conn(self):
         return self._conn
 
+    def _commit(self):
+        self.conn.commit()
+        clear_query_cache()
+
+    def _read_sql_cached(self, q: str, refresh: bool = False) -> pd.DataFrame:
+        """
+        Read query via ConnectorX (Rust; decodes the wire protocol straight into
+        column buffers). With QUERY_CACHE_TTL > 0 (opt-in, see config.py) results
+        are reused in-process for that many seconds, so repeated loads (e.g.
+        notebook re-runs) don't re-execute the JOIN; callers get a copy.
+        Cached results can be stale: only this client's writes and stream_to_copy
+        clear the cache, not writes through `conn` directly or other sessions.
+        """
+        # ConnectorX wraps the query in COPY (...) TO STDOUT and only strips a ';'
+        # that is the very last character, so trailing whitespace + ';' must go
+        q = q.strip().rstrip(";")
+        dsn = get_dsn()
+        if QUERY_CACHE_TTL <= 0:
+            return cx.read_sql(dsn, q, return_type="pandas")
+
+        # Keyed on the DSN ConnectorX actually reads from, not this client's psycopg2 conn
+        key = (dsn, q)
+        hit = _QUERY_CACHE.get(key)
+        if not refresh and hit is not None and time.monotonic() - hit[0] < QUERY_CACHE_TTL:
+            return hit[1].copy()
+        df = cx.read_sql(dsn, q, return_type="pandas")
+        _QUERY_CACHE[key] = (time.monotonic(), df)
+        return df.copy()
+
     # -----------------------------
     # Schema / tables
     # -----------------------------
@@ -120,7 +216,7 @@ class DatabaseClient:
 
         with self.conn.cursor() as cur:
             cur.execute(sql)
-        self.conn.commit()
+        self._commit()
 
     # -----------------------------
     # Departments
@@ -131,88 +227,147 @@ class DatabaseClient:
         """
         sql = """
         INSERT INTO departments (department_name, location, budget)
-        VALUES (%s, %s, %s)
+        VALUES %s
         ON CONFLICT (department_name) DO UPDATE
         SET location = EXCLUDED.location,
             budget = EXCLUDED.budget;
         """
+        # One multi-row statement can't DO UPDATE the same name twice:
+        # keep the last tuple per name (last write wins, as with per-row inserts)
+        departments = list({d[0]: d for d in departments}.values())
         with self.conn.cursor() as cur:
-            cur.executemany(sql, departments)
-        self.conn.commit()
+            execute_values(cur, sql, departments, page_size=1000)
+        self._commit()
 
-    def fetch_departments(self):
-        return pd.read_sql(
+    def fetch_departments(self, refresh: bool = False):
+        return self._read_sql_cached(
             "SELECT department_id, department_name, location, budget FROM departments ORDER BY department_id;",
-            self.conn,
+            refresh,
         )
 
     # -----------------------------
     # Employees (SAFE INSERT)
     # -----------------------------
-    def insert_employees_df(self, df: pd.DataFrame):
+    def _prepare_employees_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Inserts employees safely:
+        Returns the insert-ready employee columns:
         - converts numeric fields
         - clamps integers to Postgres INT range
-        - converts NaN/<NA>/NaT -> None
-        - rollbacks on error so connection doesn't get stuck in aborted state
-        - if still failing, prints the exact bad row
+        - drops (and prints) rows Postgres would reject before sending anything
         """
         required = ["employee_id", "name", "position", "start_date", "salary", "department_id", "is_dirty"]
         missing = [c for c in required if c not in df.columns]
         if missing:
             raise ValueError(f"Missing required columns for insert: {missing}")
 
-        PG_INT_MIN = -2147483648
-        PG_INT_MAX = 2147483647
+        # Only the insert columns are taken; coercion is column-wise so `df` is untouched
+        df2 = df[required].assign(
+            # Safe numeric conversion, clamped to Postgres INT range
+            employee_id=_to_int(df["employee_id"], PG_INT_MIN, PG_INT_MAX),
+            salary=_to_int(df["salary"], PG_INT_MIN, PG_INT_MAX),
+            department_id=_to_int(df["department_id"], PG_INT_MIN, PG_INT_MAX),
+            # Dates stay datetime64 (NaT -> NULL); the CSV writer formats them as YYYY-MM-DD
+            start_date=pd.to_datetime(df["start_date"], errors="coerce"),
+        )
 
-        df2 = df.copy()
+        # Pre-validate: the raw table accepts NULLs everywhere except the
+        # primary key, and is_dirty must be a boolean when present
+        bad = (
+            df2["employee_id"].isna()
+            | ~(df2["is_dirty"].isna() | df2["is_dirty"].isin([True, False]))
+        )
+        if bad.any():
+            print(f"❌ Dropping {int(bad.sum())} bad row(s):")
+            print(df2[bad])
+            df2 = df2[~bad]
 
-        # Safe numeric conversion
-        df2["employee_id"] = pd.to_numeric(df2["employee_id"], errors="coerce")
-        df2["salary"] = pd.to_numeric(df2["salary"], errors="coerce")
-        df2["department_id"] = pd.to_numeric(df2["department_id"], errors="coerce")
+        return df2
 
-        # Clamp to Postgres INT range
-        for col in ["employee_id", "salary", "department_id"]:
-            df2.loc[df2[col] > PG_INT_MAX, col] = PG_INT_MAX
-            df2.loc[df2[col] < PG_INT_MIN, col] = PG_INT_MIN
+    def insert_employees_df(self, df: pd.DataFrame):
+        """
+        Inserts employees safely:
+        - validates/coerces rows first (see _prepare_employees_df)
+        - streams all rows in one COPY (NaN/<NA>/NaT -> NULL)
+        - rollbacks on error so connection doesn't get stuck in aborted state
+        """
+        df2 = self._prepare_employees_df(df)
 
-        # Dates -> python date (NaT becomes NaN -> then None below)
-        df2["start_date"] = pd.to_datetime(df2["start_date"], errors="coerce").dt.date
+        with self.conn.cursor() as cur:
+            try:
+                copy_upsert(
+                    cur, "employees", list(df2.columns), _csv_buffer(df2),
+                    "ON CONFLICT (employee_id) DO NOTHING",
+                )
+            except Exception:
+                # ✅ rollback fixes "InFailedSqlTransaction"; the COPY error names the bad line
+                self.conn.rollback()
+                raise
 
-        # Convert pandas missing values to None for psycopg2
-        df2 = df2.where(pd.notnull(df2), None)
+        self._commit()
 
-        sql = """
-        INSERT INTO employees (employee_id, name, position, start_date, salary, department_id, is_dirty)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (employee_id) DO NOTHING;
+    def bulk_load_employees(self, df: pd.DataFrame, safe: bool = False):
+        """
+        Bulk-seeding variant of insert_employees_df (safe=True just calls it):
+        - same validation, TEMP staging table and COPY (TEMP tables are never
+          WAL-logged, which is what an UNLOGGED staging table would buy)
+        - only when `employees` is empty: drops its department FK(s), looked up by
+          name in pg_constraint, for the load and re-adds them NOT VALID +
+          VALIDATE CONSTRAINT, so the seed is checked in one pass instead of one
+          lookup per row. Into a non-empty table re-validating every existing row
+          would cost more than it saves, so the FK is left in place.
+        Everything runs in one transaction; on error it all rolls back, FK included.
+        The ALTER TABLEs lock employees, so use this for seeding, not live traffic.
         """
+        if safe:
+            return self.insert_employees_df(df)
 
-        rows = list(df2[required].itertuples(index=False, name=None))
+        df2 = self._prepare_employees_df(df)
 
         with self.conn.cursor() as cur:
             try:
-                cur.executemany(sql, rows)
-            except Exception as e:
-                # ✅ rollback fixes "InFailedSqlTransaction"
+                cur.execute("SELECT NOT EXISTS (SELECT 1 FROM employees);")
+                is_empty = cur.fetchone()[0]
+                fk_names = []
+                if is_empty:
+                    cur.execute(
+                        """
+                        SELECT conname FROM pg_constraint
+                        WHERE conrelid = 'employees'::regclass
+                          AND confrelid = 'departments'::regclass
+                          AND contype = 'f';
+                        """
+                    )
+                    fk_names = [r[0] for r in cur.fetchall()]
+                for name in fk_names:
+                    cur.execute(
+                        SQL("ALTER TABLE employees DROP CONSTRAINT {};").format(Identifier(name))
+                    )
+
+                copy_upsert(
+                    cur, "employees", list(df2.columns), _csv_buffer(df2),
+                    "ON CONFLICT (employee_id) DO NOTHING",
+                )
+
+                for name in fk_names:
+                    cur.execute(
+                        SQL(
+                            """
+                            ALTER TABLE employees
+                            ADD CONSTRAINT {} FOREIGN KEY (department_id)
+                            REFERENCES departments(department_id) NOT VALID;
+                            """
+                        ).format(Identifier(name))
+                    )
+                    cur.execute(
+                        SQL("ALTER TABLE employees VALIDATE CONSTRAINT {};").format(Identifier(name))
+                    )
+            except Exception:
                 self.conn.rollback()
+                raise
 
-                # Find exact failing row (row-by-row)
-                for i, r in enumerate(rows):
-                    try:
-                        cur.execute(sql, r)
-                    except Exception:
-                        self.conn.rollback()
-                        print("❌ Bad row at index:", i)
-                        print("❌ Values:", r)
-                        raise
-                raise e
-
-        self.conn.commit()
+        self._commit()
 
-    def load_employees_joined(self):
+    def load_employees_joined(self, refresh: bool = False):
         q = """
         SELECT e.employee_id, e.name, e.position, e.start_date, e.salary, e.is_dirty,
                d.department_name, d.location, d.budget
@@ -220,7 +375,7 @@ class DatabaseClient:
         LEFT JOIN departments d ON e.department_id = d.department_id
         ORDER BY e.employee_id;
         """
-        return pd.read_sql(q, self.conn)
+        return self._read_sql_cached(q, refresh)
 
     def count_employees(self):
         df = pd.read_sql("SELECT COUNT(*) AS n FROM employees;", self.conn)
@@ -239,36 +394,36 @@ class DatabaseClient:
         if missing:
             raise ValueError(f"Missing required columns for projects insert: {missing}")
 
-        df2 = df.copy()
-        df2["budget"] = pd.to_numeric(df2["budget"], errors="coerce")
-        df2["start_date"] = pd.to_datetime(df2["start_date"], errors="coerce").dt.date
-        df2["end_date"] = pd.to_datetime(df2["end_date"], errors="coerce").dt.date
-        df2 = df2.where(pd.notnull(df2), None)
+        df2 = df[required].assign(
+            budget=_to_int(df["budget"]),
+            start_date=pd.to_datetime(df["start_date"], errors="coerce"),
+            end_date=pd.to_datetime(df["end_date"], errors="coerce"),
+        )
 
-        sql = """
-        INSERT INTO projects (project_name, project_type, start_date, end_date, budget)
-        VALUES (%s, %s, %s, %s, %s)
+        on_conflict = """
         ON CONFLICT (project_name) DO UPDATE
         SET project_type = EXCLUDED.project_type,
             start_date = EXCLUDED.start_date,
             end_date = EXCLUDED.end_date,
-            budget = EXCLUDED.budget;
+            budget = EXCLUDED.budget
         """
-        rows = list(df2[required].itertuples(index=False, name=None))
 
         with self.conn.cursor() as cur:
             try:
-                cur.executemany(sql, rows)
+                copy_upsert(
+                    cur, "projects", required, _csv_buffer(df2), on_conflict,
+                    dedupe_on="project_name",
+                )
             except Exception:
                 self.conn.rollback()
                 raise
 
-        self.conn.commit()
+        self._commit()
 
-    def fetch_projects(self):
-        return pd.read_sql(
+    def fetch_projects(self, refresh: bool = False):
+        return self._read_sql_cached(
             "SELECT project_id, project_name, project_type, start_date, end_date, budget FROM projects ORDER BY project_id;",
-            self.conn,
+            refresh,
         )
 
     # -----------------------------
@@ -284,28 +439,24 @@ class DatabaseClient:
         if missing:
             raise ValueError(f"Missing required columns for employee_projects insert: {missing}")
 
-        df2 = df.copy()
-        df2["employee_id"] = pd.to_numeric(df2["employee_id"], errors="coerce")
-        df2["project_id"] = pd.to_numeric(df2["project_id"], errors="coerce")
-        df2 = df2.where(pd.notnull(df2), None)
-
-        sql = """
-        INSERT INTO employee_projects (employee_id, project_id, role_on_project)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (employee_id, project_id) DO NOTHING;
-        """
-        rows = list(df2[required].itertuples(index=False, name=None))
+        df2 = df[required].assign(
+            employee_id=_to_int(df["employee_id"]),
+            project_id=_to_int(df["project_id"]),
+        )
 
         with self.conn.cursor() as cur:
             try:
-                cur.executemany(sql, rows)
+                copy_upsert(
+                    cur, "employee_projects", required, _csv_buffer(df2),
+                    "ON CONFLICT (employee_id, project_id) DO NOTHING",
+                )
             except Exception:
                 self.conn.rollback()
                 raise
 
-        self.conn.commit()
+        self._commit()
 
-    def load_employee_projects_joined(self):
+    def load_employee_projects_joined(self, refresh: bool = False):
         q = """
         SELECT e.employee_id, e.name, e.position, e.start_date, e.salary, e.is_dirty,
                d.department_name,
@@ -316,7 +467,7 @@ class DatabaseClient:
         LEFT JOIN departments d ON e.department_id = d.department_id
         JOIN projects p ON ep.project_id = p.project_id;
         """
-        return pd.read_sql(q, self.conn)
+        return self._read_sql_cached(q, refresh)
 
     # -----------------------------
     # Debug helpers
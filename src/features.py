@@ -1,10 +1,22 @@
+import numpy as np
 import pandas as pd
 
+NS_PER_DAY = 86_400_000_000_000
+
 def add_features(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["start_date"] = pd.to_datetime(out["start_date"], errors="coerce")
-    out["start_year"] = out["start_date"].dt.year
+    start_date = df["start_date"]
+    # EmployeeCleaner.clean already returns datetime64; only parse raw input
+    if not pd.api.types.is_datetime64_any_dtype(start_date):
+        start_date = pd.to_datetime(start_date, errors="coerce")
 
+    # Whole days of service on raw int64 nanoseconds (no timedelta64 Series in between)
     today = pd.Timestamp(pd.Timestamp.today().date())
-    out["years_of_service"] = ((today - out["start_date"]).dt.days / 365.25).round(2)
-    return out
+    start_ns = start_date.to_numpy(dtype="datetime64[ns]")
+    days = (today.value - start_ns.view("i8")) // NS_PER_DAY
+    years = np.where(np.isnat(start_ns), np.nan, np.round(days / 365.25, 2))
+
+    return df.assign(
+        start_date=start_date,
+        start_year=start_date.dt.year,
+        years_of_service=years,
+    )
@@ -1,4 +1,5 @@
-import random
+import csv
+import io
 from datetime import date
 import numpy as np
 import pandas as pd
@@ -7,70 +8,149 @@ from faker import Faker
 from .config import POSITIONS, NON_IT_TITLES
 
 
+class _LineStream:
+    """Minimal file-like for cursor.copy_expert: read(size) pulls lines from an iterator."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buf = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buf) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buf += line
+        if size < 0:
+            size = len(self._buf)
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
 class EmployeeDataGenerator:
     """Generates synthetic employee records and injects dirty/incomplete/illogical data."""
 
     def __init__(self, seed: int = 42):
         self.fake = Faker()
         Faker.seed(seed)
-        random.seed(seed)
-        np.random.seed(seed)
-
-    def _random_date_2015_2024(self):
-        start = date(2015, 1, 1).toordinal()
-        end = date(2024, 12, 31).toordinal()
-        return date.fromordinal(random.randint(start, end))
-
-    def generate(self, n: int = 500, dirty_frac: float = 0.20, department_ids=None) -> pd.DataFrame:
+        self.rng = np.random.default_rng(seed)
+        self._name_pool = np.array([], dtype=object)
+
+    def _random_dates(self, n: int):
+        """n uniform dates in 2015-01-01..2024-12-31 as a datetime64[D] array."""
+        span = (date(2024, 12, 31) - date(2015, 1, 1)).days + 1
+        return np.datetime64("2015-01-01", "D") + self.rng.integers(0, span, size=n).astype("timedelta64[D]")
+
+    def _names(self, n: int, fast_names: bool):
+        # Faker has no batch API; fast_names samples from a pool (up to 5000 names)
+        # built once per generator and only grown when a larger n needs it.
+        # The first call costs the same Faker calls as the normal path; later calls
+        # are a single draw, without replacement while the pool is large enough
+        if fast_names:
+            size = min(n, 5000)
+            if len(self._name_pool) < size:
+                extra = [self.fake.name() for _ in range(size - len(self._name_pool))]
+                self._name_pool = np.concatenate([self._name_pool, np.array(extra, dtype=object)])
+            return self.rng.choice(self._name_pool, size=n, replace=n > len(self._name_pool))
+        return np.array([self.fake.name() for _ in range(n)], dtype=object)
+
+    def _columns(self, n: int, dirty_frac: float, department_ids, fast_names: bool) -> dict:
         if department_ids is None:
             department_ids = [None]
 
-        rows = []
-        used_ids = set()
-
+        # Clean columns, drawn whole-column at a time
+        # Unique 6-digit ids: one sample without replacement from the 900k id space
+        emp_ids = self.rng.choice(900000, size=n, replace=False) + 100000
+        names = self._names(n, fast_names)
+        positions = self.rng.choice(np.array(POSITIONS, dtype=object), size=n)
+        start_dates = self._random_dates(n)
+        salaries = self.rng.integers(60000, 200001, size=n)
+        dept_ids = self.rng.choice(department_ids, size=n)
+
+        # Dirty rows: indices, issue types and per-field draws are all drawn up front,
+        # sized to the dirty rows only, then applied by index
         dirty_n = int(round(n * dirty_frac))
-        dirty_idx = set(random.sample(range(n), dirty_n))
-
-        for i in range(n):
-            emp_id = random.randint(100000, 999999)
-            while emp_id in used_ids:
-                emp_id = random.randint(100000, 999999)
-            used_ids.add(emp_id)
-
-            name = self.fake.name()
-            position = random.choice(POSITIONS)
-            start_date = self._random_date_2015_2024()
-            salary = random.randint(60000, 200000)
-            dept_id = random.choice(department_ids)
-            is_dirty = i in dirty_idx
-
-            if is_dirty:
-                issue_type = random.choice(["missing", "salary", "date", "title", "mixed"])
-
-                if issue_type in ["missing", "mixed"]:
-                    if random.random() < 0.6: name = None
-                    if random.random() < 0.6: position = None
-                    if random.random() < 0.6: start_date = None
-                    if random.random() < 0.6: salary = None
-
-                if issue_type in ["salary", "mixed"]:
-                    # Dirty but safe for Postgres INTEGER
-                    salary = random.choice([-5000, 0, 45000, 350000, 2000000])
-
-                if issue_type in ["date", "mixed"]:
-                    start_date = random.choice([date(2010, 5, 1), date(2030, 1, 1), date(2025, 12, 31)])
-
-                if issue_type in ["title", "mixed"]:
-                    position = random.choice(NON_IT_TITLES)
-
-            rows.append({
-                "employee_id": emp_id,
-                "name": name,
-                "position": position,
-                "start_date": start_date,
-                "salary": salary,
-                "department_id": dept_id,
-                "is_dirty": is_dirty
-            })
-
-        return pd.DataFrame(rows)
+        dirty_idx = self.rng.choice(n, size=dirty_n, replace=False)
+        is_dirty = np.zeros(n, dtype=bool)
+        is_dirty[dirty_idx] = True
+
+        issue_type = self.rng.choice(["missing", "salary", "date", "title", "mixed"], size=dirty_n)
+        drop = self.rng.random((dirty_n, 4)) < 0.6  # name, position, start_date, salary
+
+        # Missing values (each field dropped with p=0.6)
+        missing = np.isin(issue_type, ["missing", "mixed"])
+        names[dirty_idx[missing & drop[:, 0]]] = None
+        positions[dirty_idx[missing & drop[:, 1]]] = None
+        start_dates[dirty_idx[missing & drop[:, 2]]] = np.datetime64("NaT")
+        salary_missing = np.zeros(n, dtype=bool)
+        salary_missing[dirty_idx[missing & drop[:, 3]]] = True
+
+        # Dirty but safe for Postgres INTEGER
+        bad_salary = dirty_idx[np.isin(issue_type, ["salary", "mixed"])]
+        salaries[bad_salary] = self.rng.choice([-5000, 0, 45000, 350000, 2000000], size=len(bad_salary))
+        salary_missing[bad_salary] = False
+
+        bad_date = dirty_idx[np.isin(issue_type, ["date", "mixed"])]
+        start_dates[bad_date] = self.rng.choice(
+            np.array(["2010-05-01", "2030-01-01", "2025-12-31"], dtype="datetime64[D]"),
+            size=len(bad_date),
+        )
+
+        bad_title = dirty_idx[np.isin(issue_type, ["title", "mixed"])]
+        positions[bad_title] = self.rng.choice(np.array(NON_IT_TITLES, dtype=object), size=len(bad_title))
+
+        return {
+            "employee_id": emp_ids,
+            "name": names,
+            "position": positions,
+            "start_date": start_dates,
+            "salary": pd.Series(salaries).mask(salary_missing),
+            "department_id": dept_ids,
+            "is_dirty": is_dirty,
+        }
+
+    def generate(self, n: int = 500, dirty_frac: float = 0.20, department_ids=None,
+                 fast_names: bool = False) -> pd.DataFrame:
+        return pd.DataFrame(self._columns(n, dirty_frac, department_ids, fast_names))
+
+    def _csv_lines(self, cols: dict):
+        """Yields one COPY CSV line per employee (NULL = \\N)."""
+        null = "\\N"
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        for emp_id, name, position, start_date, salary, dept_id, is_dirty in zip(*cols.values()):
+            writer.writerow([
+                emp_id,
+                null if name is None else name,
+                null if position is None else position,
+                null if np.isnat(start_date) else start_date,
+                null if np.isnan(salary) else int(salary),
+                null if dept_id is None else dept_id,
+                is_dirty,
+            ])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+
+    def stream_to_copy(self, conn, n: int = 500, dirty_frac: float = 0.20, department_ids=None,
+                       fast_names: bool = False):
+        """
+        Seeds the employees table straight from the generator:
+        rows are formatted as CSV lines on demand and streamed through one COPY,
+        with no DataFrame or per-row tuples in between. Existing ids are skipped.
+        """
+        # Imported here so generate() works without the DB stack (psycopg2/connectorx) installed
+        from .db import clear_query_cache, copy_upsert
+
+        cols = self._columns(n, dirty_frac, department_ids, fast_names)
+        with conn.cursor() as cur:
+            try:
+                copy_upsert(
+                    cur, "employees", list(cols), _LineStream(self._csv_lines(cols)),
+                    "ON CONFLICT (employee_id) DO NOTHING",
+                )
+            except Exception:
+                conn.rollback()
+                raise
+        conn.commit()
+        clear_query_cache()
@@ -1,8 +1,10 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
 def add_salary_scaled(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    scaler = MinMaxScaler()
-    out["salary_scaled"] = scaler.fit_transform(out[["salary"]])
-    return out
+    # Min-max scaling to [0, 1]; same result as sklearn's MinMaxScaler
+    # (NaN ignored for min/max, constant column -> 0) without the fit overhead
+    s = df["salary"].to_numpy(dtype=float)
+    lo, hi = np.nanmin(s), np.nanmax(s)
+    span = hi - lo if hi > lo else 1.0
+    return df.assign(salary_scaled=(s - lo) / span)